@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""
+Script to measure server startup and simulation latency.
+Starts main.py on a free port, waits for /api/ready and times simulations
+of a network file (default: default_network.json).
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def request(url, data=None):
+    body = json.dumps(data).encode("utf-8") if data is not None else None
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def wait_for(url, ok_status=(200,), timeout=120.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            status, body = request(url)
+            if status in ok_status:
+                return body
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.02)
+    raise TimeoutError(f"{url} not available after {timeout}s")
+
+
+def run_benchmark(network_path, repeats=5):
+    with open(network_path, "r") as f:
+        network = json.load(f)
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, HOST="127.0.0.1", PORT=str(port))
+
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "main.py"], env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    try:
+        # Any HTTP answer (including 503) means the server accepts requests
+        wait_for(f"{base_url}/api/ready", ok_status=(200, 503))
+        listening_s = time.perf_counter() - start
+
+        state = wait_for(f"{base_url}/api/ready")
+        ready_s = time.perf_counter() - start
+
+        print("Startup:")
+        print(f"  listening:        {listening_s:.3f} s")
+        print(f"  ready:            {ready_s:.3f} s")
+        for name, value in state["timings"].items():
+            print(f"  {name + ':':<17} {value:.3f} s")
+
+        t = time.perf_counter()
+        status, results = request(f"{base_url}/api/simulate", network)
+        first_s = time.perf_counter() - t
+
+        cached = []
+        for _ in range(repeats):
+            t = time.perf_counter()
+            request(f"{base_url}/api/simulate", network)
+            cached.append(time.perf_counter() - t)
+
+        print(f"Simulation ({network_path}):")
+        print(f"  first:            {first_s:.3f} s (success: {results.get('success')})")
+        print(f"  cached (median):  {sorted(cached)[len(cached) // 2]:.3f} s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    run_benchmark(sys.argv[1] if len(sys.argv) > 1 else "default_network.json")
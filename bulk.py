@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+
+"""
+Bulk import and export of stored networks.
+
+Networks are exchanged as NDJSON, one {"name", "description", "created_at",
+"network"} object per line, optionally gzip-compressed, or as a tar archive
+with one such JSON file per network. Rows are read in batches from a
+streaming cursor and written in batched transactions, so memory use does
+not grow with the number of networks.
+
+Usage:
+    python bulk.py export networks.ndjson.gz
+    python bulk.py import networks.ndjson.gz
+"""
+
+import argparse
+import io
+import json
+import sys
+import tarfile
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, init_db
+from models import Network
+from schemas import SaveNetworkRequest
+
+BATCH_SIZE = 500
+
+# zlib window bits for the gzip container
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def export_records(db: Session, batch_size: int = BATCH_SIZE) -> Iterator[str]:
+    """Yield one JSON line (without newline) per stored network, in id order."""
+    rows = db.execute(
+        select(Network.name, Network.description, Network.created_at, Network.data)
+        .order_by(Network.id)
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+    for name, description, created_at, data in rows:
+        header = json.dumps({
+            "name": name,
+            "description": description,
+            "created_at": created_at.isoformat() if created_at else None,
+        })
+        # data is already a JSON document; splice it in rather than re-parsing it
+        yield f'{header[:-1]}, "network": {data}}}'
+
+
+def iter_ndjson(lines: Iterable[str], compress: bool = True) -> Iterator[bytes]:
+    """Encode lines as NDJSON chunks, gzip-compressed incrementally if ``compress``."""
+    compressor = zlib.compressobj(wbits=GZIP_WBITS) if compress else None
+    for line in lines:
+        chunk = (line + "\n").encode("utf-8")
+        if compressor is None:
+            yield chunk
+        else:
+            chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+    if compressor is not None:
+        yield compressor.flush()
+
+
+class LineDecoder:
+    """Incrementally split a byte stream into text lines, gunzipping it if it starts with the gzip magic.
+
+    Concatenated gzip members (``cat a.gz b.gz``) are decoded one after the
+    other; finish() raises ValueError if the last member is incomplete.
+    """
+
+    def __init__(self):
+        self._gzip = None  # unknown until the first two bytes have arrived
+        self._pending = b""
+        self._decompressor = None
+        self._buffer = b""
+
+    def feed(self, chunk: bytes) -> List[str]:
+        if self._gzip is None:
+            self._pending += chunk
+            if len(self._pending) < len(GZIP_MAGIC):
+                return []
+            chunk, self._pending = self._pending, b""
+            self._gzip = chunk.startswith(GZIP_MAGIC)
+            if self._gzip:
+                self._decompressor = zlib.decompressobj(wbits=GZIP_WBITS)
+
+        if self._gzip:
+            chunk = self._decompress(chunk)
+
+        *lines, self._buffer = (self._buffer + chunk).split(b"\n")
+        return [line.decode("utf-8") for line in lines if line.strip()]
+
+    def finish(self) -> List[str]:
+        if self._gzip is None:
+            # Fewer bytes than the gzip magic: plain text
+            self._buffer += self._pending
+            self._pending = b""
+        elif self._gzip:
+            self._buffer += self._decompressor.flush()
+            if not self._decompressor.eof:
+                raise ValueError("truncated gzip stream")
+
+        rest, self._buffer = self._buffer, b""
+        return [rest.decode("utf-8")] if rest.strip() else []
+
+    def _decompress(self, data: bytes) -> bytes:
+        output = []
+        try:
+            while data:
+                if self._decompressor.eof:
+                    # Previous member ended; the rest of the data starts the next one
+                    self._decompressor = zlib.decompressobj(wbits=GZIP_WBITS)
+                output.append(self._decompressor.decompress(data))
+                data = self._decompressor.unused_data
+        except zlib.error as e:
+            raise ValueError(f"invalid gzip stream: {str(e)}")
+        return b"".join(output)
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Split a byte stream into text lines; see LineDecoder."""
+    decoder = LineDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.finish()
+
+
+class NetworkImporter:
+    """Validate JSON lines and insert them as networks, committing every ``batch_size`` rows.
+
+    add() raises ValueError naming the offending line; batches committed
+    before it are kept.
+    """
+
+    def __init__(self, db: Session, batch_size: int = BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+        self.imported = 0
+        self._batch = []
+        self._line_number = 0
+
+    def add(self, line: str) -> None:
+        self._line_number += 1
+        try:
+            self._batch.append(self._to_row(json.loads(line)))
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(
+                f"Line {self._line_number}: {str(e)} ({self.imported} networks imported before the error)"
+            )
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._batch:
+            self.db.execute(insert(Network), self._batch)
+            self.db.commit()
+            self.imported += len(self._batch)
+            self._batch.clear()
+
+    @staticmethod
+    def _to_row(record: dict) -> dict:
+        network_data = SaveNetworkRequest.model_validate(record)
+        row = {
+            "name": network_data.name,
+            "description": network_data.description,
+            "data": json.dumps(network_data.network.model_dump()),
+        }
+        if record.get("created_at"):
+            row["created_at"] = datetime.fromisoformat(record["created_at"])
+        return row
+
+
+def import_records(db: Session, lines: Iterable[str], batch_size: int = BATCH_SIZE) -> int:
+    """Insert networks from JSON lines and return how many were imported."""
+    importer = NetworkImporter(db, batch_size)
+    for line in lines:
+        importer.add(line)
+    importer.flush()
+    return importer.imported
+
+
+def _is_tar(path: str) -> bool:
+    return path.endswith((".tar", ".tar.gz", ".tgz"))
+
+
+def export_to_file(path: str, batch_size: int = BATCH_SIZE) -> int:
+    """Write all stored networks to ``path`` (.ndjson, .ndjson.gz/.gz or .tar/.tar.gz/.tgz)."""
+    db = SessionLocal()
+    count = 0
+    try:
+        if _is_tar(path):
+            mode = "w|" if path.endswith(".tar") else "w|gz"
+            with tarfile.open(path, mode) as archive:
+                for count, line in enumerate(export_records(db, batch_size), start=1):
+                    payload = line.encode("utf-8")
+                    info = tarfile.TarInfo(f"networks/{count:08d}.json")
+                    info.size = len(payload)
+                    archive.addfile(info, io.BytesIO(payload))
+        else:
+            def counted_lines():
+                nonlocal count
+                for line in export_records(db, batch_size):
+                    count += 1
+                    yield line
+
+            with open(path, "wb") as f:
+                for chunk in iter_ndjson(counted_lines(), compress=path.endswith(".gz")):
+                    f.write(chunk)
+        return count
+    finally:
+        db.close()
+
+
+def _read_file_lines(path: str, chunk_size: int = 1 << 16) -> Iterator[str]:
+    if _is_tar(path):
+        mode = "r|" if path.endswith(".tar") else "r|gz"
+        with tarfile.open(path, mode) as archive:
+            for member in archive:
+                if member.isfile():
+                    yield archive.extractfile(member).read().decode("utf-8")
+    else:
+        with open(path, "rb") as f:
+            yield from iter_lines(iter(lambda: f.read(chunk_size), b""))
+
+
+def import_from_file(path: str, batch_size: int = BATCH_SIZE) -> int:
+    """Insert all networks from ``path``; see export_to_file() for the formats."""
+    db = SessionLocal()
+    try:
+        return import_records(db, _read_file_lines(path), batch_size)
+    finally:
+        db.close()
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import/export of stored networks")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path", help=".ndjson, .ndjson.gz or .tar.gz archive")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    init_db()
+
+    try:
+        if args.command == "export":
+            count = export_to_file(args.path, args.batch_size)
+            print(f"Exported {count} networks to {args.path}")
+        else:
+            count = import_from_file(args.path, args.batch_size)
+            print(f"Imported {count} networks from {args.path}")
+    except Exception as e:
+        print(f"Error during {args.command}: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
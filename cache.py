@@ -0,0 +1,120 @@
+"""
+Result cache for simulations and compiled networks.
+
+A single process keeps an in-memory LRU cache. In multi-worker mode the
+parent starts a cache server on a local Unix socket before forking, and
+every worker talks to that one cache instead of keeping its own copy.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from multiprocessing.managers import BaseManager
+from typing import Any, Optional
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "256"))
+
+
+class LRUCache:
+    """Thread-safe LRU mapping of string keys to bytes values."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key not in self._data:
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return self._data[key]
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._data), "hits": self._hits, "misses": self._misses}
+
+
+class CacheManager(BaseManager):
+    pass
+
+
+# Server side: one LRUCache instance shared by all connections
+_shared_cache = None
+
+
+def _get_shared_cache() -> LRUCache:
+    return _shared_cache
+
+
+CacheManager.register("get_cache", callable=_get_shared_cache)
+
+# Client side: set by start_cache_server() in the parent, inherited by forked workers
+_server_address = None
+_server_authkey = None
+_local = threading.local()
+_local_cache = None
+
+
+def _init_server(max_entries: int) -> None:
+    global _shared_cache
+    _shared_cache = LRUCache(max_entries)
+
+
+def start_cache_server(max_entries: int = DEFAULT_MAX_ENTRIES) -> CacheManager:
+    """Start the shared cache server and point get_cache() of this process and its forks at it."""
+    global _server_address, _server_authkey
+
+    address = os.path.join(tempfile.mkdtemp(prefix="gasnet-cache-"), "cache.sock")
+    authkey = os.urandom(32)
+
+    manager = CacheManager(address=address, authkey=authkey)
+    manager.start(initializer=_init_server, initargs=(max_entries,))
+
+    _server_address = address
+    _server_authkey = authkey
+    return manager
+
+
+def get_cache():
+    """Return the cache for the calling thread: a proxy to the shared server if one is running."""
+    global _local_cache
+
+    if _server_address is None:
+        if _local_cache is None:
+            _local_cache = LRUCache()
+        return _local_cache
+
+    # Proxies hold a connection each, so keep one per thread and per (forked) process
+    proxy = getattr(_local, "proxy", None)
+    if proxy is None or getattr(_local, "pid", None) != os.getpid():
+        manager = CacheManager(address=_server_address, authkey=_server_authkey)
+        manager.connect()
+        proxy = manager.get_cache()
+        _local.proxy = proxy
+        _local.pid = os.getpid()
+    return proxy
+
+
+def cache_key(*parts: Any) -> str:
+    """Stable key for JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -1,21 +1,36 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from contextlib import asynccontextmanager
 from typing import List
 import json
 import os
+import pickle
 
-from database import get_db
+from bulk import LineDecoder, NetworkImporter, export_records, iter_ndjson
+from cache import get_cache, cache_key
+from database import SessionLocal, get_db, init_db
 from models import Network
 from schemas import (
     NetworkRequest, NetworkResponse, NetworkListResponse, 
-    SimulationResponse, SaveNetworkRequest
+    SimulationResponse, SaveNetworkRequest, EstimateRequest, EstimateResponse,
+    OptimizeOptions, OptimizeRequest, OptimizeResponse
 )
-from pandapipes_adapter import create_network_from_json, run_simulation
+from startup import start_warm_up, readiness
 
-app = FastAPI(title="Gas Network Simulation API", version="1.0.0")
+# pandapipes_adapter (and with it pandapipes) is imported inside the handlers
+# that need it, so that importing this module stays fast; the warm-up thread
+# started below loads it in the background.
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    start_warm_up()
+    yield
+
+app = FastAPI(title="Gas Network Simulation API", version="1.0.0", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -30,6 +45,38 @@ app.add_middleware(
 app.mount("/static", StaticFiles(directory="static"), name="static")
 app.mount("/assets", StaticFiles(directory=os.path.join("static", "assets")), name="assets")
 
+def build_network(network_dict: dict, fluid: str):
+    """Create a pandapipes network, reusing a cached compiled copy when available."""
+    from pandapipes_adapter import create_network_from_json
+    
+    cache = get_cache()
+    key = cache_key("net", network_dict, fluid)
+    cached = cache.get(key)
+    if cached is not None:
+        return pickle.loads(cached)
+    
+    net = create_network_from_json(network_dict, fluid=fluid)
+    cache.set(key, pickle.dumps(net))
+    return net
+
+def simulate_cached(network_dict: dict, fluid: str, sensitivity: bool) -> dict:
+    """Run a simulation, serving repeated requests from the result cache."""
+    cache = get_cache()
+    key = cache_key("simulation", network_dict, fluid, sensitivity)
+    cached = cache.get(key)
+    if cached is not None:
+        return json.loads(cached)
+    
+    from pandapipes_adapter import run_simulation
+    
+    net = build_network(network_dict, fluid)
+    results = run_simulation(net, network_dict, sensitivity=sensitivity)
+    
+    # Only converged results are worth replaying
+    if results["success"]:
+        cache.set(key, json.dumps(results).encode("utf-8"))
+    return results
+
 @app.get("/")
 async def read_index():
     """Serve the main React app."""
@@ -38,18 +85,24 @@ async def read_index():
         return FileResponse(index_path)
     return {"message": "Gas Network Simulation API - Frontend not built yet. Run 'cd frontend && npm run build'"}
 
+@app.get("/api/ready")
+async def ready():
+    """Readiness probe: 200 once the simulation stack is imported and warmed up, 503 before."""
+    state = readiness()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if state["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=state
+    )
+
 @app.post("/api/simulate", response_model=SimulationResponse)
-async def simulate_network(network: NetworkRequest, fluid: str = "lgas"):
+async def simulate_network(network: NetworkRequest, fluid: str = "lgas", sensitivity: bool = False):
     """Run simulation on a gas network."""
     try:
         # Convert to dict for pandapipes adapter
         network_dict = network.model_dump()
         
-        # Create pandapipes network
-        net = create_network_from_json(network_dict, fluid=fluid)
-        
         # Run simulation
-        results = run_simulation(net, network_dict)
+        results = simulate_cached(network_dict, fluid, sensitivity)
         
         return SimulationResponse(**results)
         
@@ -59,6 +112,44 @@ async def simulate_network(network: NetworkRequest, fluid: str = "lgas"):
             detail=f"Simulation failed: {str(e)}"
         )
 
+@app.post("/api/sensitivity/estimate", response_model=EstimateResponse)
+async def estimate_sensitivity(request: EstimateRequest):
+    """Estimate node pressures for small input changes from a sensitivity matrix."""
+    from pandapipes_adapter import estimate_from_sensitivity
+    
+    try:
+        results = estimate_from_sensitivity(request.sensitivity.model_dump(), request.deltas)
+        return EstimateResponse(**results)
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@app.post("/api/optimize", response_model=OptimizeResponse)
+def optimize_network(request: OptimizeRequest, fluid: str = "lgas"):
+    """Find minimal ext_grid pressures and compressor ratios meeting all sink p_min_bar.
+
+    Plain def so FastAPI runs the pipeflow search in its threadpool instead
+    of blocking the event loop.
+    """
+    from pandapipes_adapter import optimize_setpoints
+    
+    try:
+        network_dict = request.network.model_dump()
+        net = build_network(network_dict, fluid)
+        
+        results = optimize_setpoints(net, network_dict, **request.model_dump(exclude={"network"}))
+        
+        return OptimizeResponse(**results)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Optimization failed: {str(e)}"
+        )
+
 @app.post("/api/networks", response_model=dict)
 async def save_network(network_data: SaveNetworkRequest, db: Session = Depends(get_db)):
     """Save a network to the database."""
@@ -118,6 +209,52 @@ async def list_networks(db: Session = Depends(get_db)):
             detail=f"Failed to retrieve networks: {str(e)}"
         )
 
+@app.get("/api/networks/export")
+async def export_networks(compress: bool = True):
+    """Stream all saved networks as NDJSON, gzip-compressed by default."""
+    def generate():
+        # The response outlives the request dependencies, so use an own session
+        db = SessionLocal()
+        try:
+            yield from iter_ndjson(export_records(db), compress=compress)
+        finally:
+            db.close()
+    
+    filename = "networks.ndjson.gz" if compress else "networks.ndjson"
+    return StreamingResponse(
+        generate(),
+        media_type="application/gzip" if compress else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.post("/api/networks/import")
+async def import_networks(request: Request, db: Session = Depends(get_db)):
+    """Import networks from a streamed NDJSON body (plain or gzip-compressed)."""
+    decoder = LineDecoder()
+    importer = NetworkImporter(db)
+    
+    try:
+        async for chunk in request.stream():
+            for line in decoder.feed(chunk):
+                importer.add(line)
+        for line in decoder.finish():
+            importer.add(line)
+        importer.flush()
+        
+        return {"imported": importer.imported}
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to import networks: {str(e)}"
+        )
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import networks: {str(e)} ({importer.imported} networks imported before the error)"
+        )
+
 @app.get("/api/networks/{network_id}")
 async def get_network(network_id: int, db: Session = Depends(get_db)):
     """Get a specific network by ID."""
@@ -175,7 +312,7 @@ async def delete_network(network_id: int, db: Session = Depends(get_db)):
         )
 
 @app.post("/api/simulate/{network_id}", response_model=SimulationResponse)
-async def simulate_stored_network(network_id: int, fluid: str = "lgas", db: Session = Depends(get_db)):
+async def simulate_stored_network(network_id: int, fluid: str = "lgas", sensitivity: bool = False, db: Session = Depends(get_db)):
     """Run simulation on a stored network."""
     try:
         # Get network from database
@@ -189,11 +326,8 @@ async def simulate_stored_network(network_id: int, fluid: str = "lgas", db: Sess
         # Parse JSON data
         network_dict = json.loads(network.data)
         
-        # Create pandapipes network
-        net = create_network_from_json(network_dict, fluid=fluid)
-        
         # Run simulation
-        results = run_simulation(net, network_dict)
+        results = simulate_cached(network_dict, fluid, sensitivity)
         
         return SimulationResponse(**results)
         
@@ -205,6 +339,47 @@ async def simulate_stored_network(network_id: int, fluid: str = "lgas", db: Sess
             detail=f"Simulation failed: {str(e)}"
         )
 
+@app.post("/api/optimize/{network_id}", response_model=OptimizeResponse)
+def optimize_stored_network(network_id: int, options: OptimizeOptions, fluid: str = "lgas", db: Session = Depends(get_db)):
+    """Find minimal setpoints for a stored network."""
+    from pandapipes_adapter import optimize_setpoints
+    
+    try:
+        network = db.query(Network).filter(Network.id == network_id).first()
+        if not network:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Network not found"
+            )
+        
+        network_dict = json.loads(network.data)
+        net = build_network(network_dict, fluid)
+        
+        results = optimize_setpoints(net, network_dict, **options.model_dump())
+        
+        return OptimizeResponse(**results)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Optimization failed: {str(e)}"
+        )
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Get entry count and hit/miss counters of the result cache."""
+    return get_cache().stats()
+
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    host = os.environ.get("HOST", "0.0.0.0")
+    port = int(os.environ.get("PORT", "8000"))
+    workers = int(os.environ.get("WORKERS", "1"))
+    
+    if workers > 1:
+        from workers import serve_forked
+        serve_forked(app, host=host, port=port, workers=workers)
+    else:
+        import uvicorn
+        uvicorn.run(app, host=host, port=port)
\ No newline at end of file
@@ -1,13 +1,28 @@
 import pandapipes as pp
 import pandapower as ppower
 from typing import Dict, Any, List
+import copy
 import json
+import math
+import pickle
+
+# Pickled empty networks per fluid, so fluid property and std-type tables
+# are read from disk once per process instead of on every request
+_EMPTY_NETWORKS: Dict[str, bytes] = {}
+
+
+def _create_empty_network(fluid: str) -> pp.pandapipesNet:
+    """Return a fresh empty network with fluid and std types, built from a cached template."""
+    if fluid not in _EMPTY_NETWORKS:
+        _EMPTY_NETWORKS[fluid] = pickle.dumps(pp.create_empty_network(fluid=fluid, add_stdtypes=True))
+    return pickle.loads(_EMPTY_NETWORKS[fluid])
+
 
 def create_network_from_json(data: Dict[str, Any], fluid: str = "lgas") -> pp.pandapipesNet:
     """Convert JSON network representation to pandapipes network."""
     
     # Create empty network
-    net = pp.create_empty_network(fluid=fluid, add_stdtypes=True)
+    net = _create_empty_network(fluid)
     
     # Store mapping from node IDs to pandapipes junction indices
     node_to_junction = {}
@@ -266,8 +281,12 @@ def create_network_from_json(data: Dict[str, Any], fluid: str = "lgas") -> pp.pa
     return net
 
 
-def run_simulation(net: pp.pandapipesNet, original_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Run pandapipes simulation and extract results."""
+def run_simulation(net: pp.pandapipesNet, original_data: Dict[str, Any], sensitivity: bool = False) -> Dict[str, Any]:
+    """Run pandapipes simulation and extract results.
+
+    If ``sensitivity`` is set, the response also carries the dp_node/d_input
+    matrix from :func:`compute_sensitivities` around the converged solution.
+    """
     
     try:
         # Run the pipe flow calculation
@@ -372,12 +391,21 @@ def run_simulation(net: pp.pandapipesNet, original_data: Dict[str, Any]) -> Dict
 
             edge_results.append(result)
 
-        return {
+        response = {
             "nodes": node_results,
             "edges": edge_results,
             "success": True,
             "message": "Simulation completed successfully"
         }
+
+        if sensitivity:
+            # A failed perturbation solve should not hide the converged results
+            try:
+                response["sensitivity"] = compute_sensitivities(net, original_data)
+            except Exception as e:
+                response["message"] += f" (sensitivity unavailable: {str(e)})"
+
+        return response
         
     except Exception as e:
         return {
@@ -385,4 +413,401 @@ def run_simulation(net: pp.pandapipesNet, original_data: Dict[str, Any]) -> Dict
             "edges": [],
             "success": False,
             "message": f"Simulation failed: {str(e)}"
-        }
\ No newline at end of file
+        }
+
+
+# Tunable inputs for sensitivity analysis: node/edge type -> (pandapipes table, column, JSON parameter)
+SENSITIVITY_INPUTS = {
+    "external_grid": ("ext_grid", "p_bar", "p_bar"),
+    "source": ("source", "mdot_kg_per_s", "mdot_kg_per_s"),
+    "compressor": ("compressor", "pressure_ratio", "pressure_ratio"),
+}
+
+
+def _sensitivity_inputs(original_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Locate the pandapipes table row behind every tunable node/edge parameter.
+
+    Mirrors the creation order of :func:`create_network_from_json`: elements
+    created from nodes come first, then compressors created from edges.
+    Edges with an unknown end node are skipped there, so they are skipped
+    here as well.
+    """
+    counters = {table: 0 for table, _, _ in SENSITIVITY_INPUTS.values()}
+    inputs = []
+
+    node_ids = {node["id"] for node in original_data.get("nodes", [])}
+    elements = list(original_data.get("nodes", []))
+    elements += [
+        edge for edge in original_data.get("edges", [])
+        if edge["type"] == "compressor" and edge["from_node"] in node_ids and edge["to_node"] in node_ids
+    ]
+
+    for element in elements:
+        if element["type"] not in SENSITIVITY_INPUTS:
+            continue
+        table, column, parameter = SENSITIVITY_INPUTS[element["type"]]
+        inputs.append({
+            "id": f"{element['id']}.{parameter}",
+            "element_id": element["id"],
+            "parameter": parameter,
+            "table": table,
+            "column": column,
+            "index": counters[table],
+        })
+        counters[table] += 1
+
+    return inputs
+
+
+def compute_sensitivities(
+    net: pp.pandapipesNet,
+    original_data: Dict[str, Any],
+    rel_step: float = 0.01,
+    max_rel_delta: float = 0.1,
+    tol: float = 1e-9,
+) -> Dict[str, Any]:
+    """Compute the sparse sensitivity matrix dp_node/d_input of a converged net.
+
+    pandapipes does not expose the final Newton-Raphson Jacobian, so each
+    column is obtained from one perturbed pipeflow on a copy of ``net``
+    (forward difference with a step of ``rel_step`` times the input value).
+    Entries smaller than ``tol`` are dropped. ``max_rel_delta`` sets the
+    range, relative to the input value, in which linearized estimates from
+    :func:`estimate_from_sensitivity` are trusted.
+    """
+    base_pressures = net.res_junction.p_bar.values.copy()
+    node_ids = [node["id"] for node in original_data.get("nodes", [])]
+
+    nodes = []
+    for i, node_data in enumerate(original_data.get("nodes", [])):
+        pressure = float(base_pressures[i]) if i < len(base_pressures) else math.nan
+        p_min_bar = node_data.get("params", {}).get("p_min_bar", 0) if node_data["type"] == "sink" else None
+        nodes.append({
+            "id": node_data["id"],
+            "pressure_bar": None if math.isnan(pressure) else pressure,
+            "p_min_bar": p_min_bar,
+        })
+
+    work_net = copy.deepcopy(net)
+    inputs = []
+    entries = []
+    solves = 0
+
+    for inp in _sensitivity_inputs(original_data):
+        table = work_net[inp["table"]]
+        value = float(table.at[inp["index"], inp["column"]])
+        step = max(abs(value) * rel_step, 1e-3)
+
+        table.at[inp["index"], inp["column"]] = value + step
+        try:
+            pp.pipeflow(work_net)
+            solves += 1
+        finally:
+            table.at[inp["index"], inp["column"]] = value
+
+        dp = (work_net.res_junction.p_bar.values - base_pressures) / step
+        for i, node_id in enumerate(node_ids[:len(dp)]):
+            if not math.isnan(dp[i]) and abs(dp[i]) > tol:
+                entries.append({"node_id": node_id, "input_id": inp["id"], "dp_dinput": float(dp[i])})
+
+        inputs.append({
+            "id": inp["id"],
+            "element_id": inp["element_id"],
+            "parameter": inp["parameter"],
+            "value": value,
+            "max_delta": max(abs(value) * max_rel_delta, step),
+        })
+
+    return {
+        "nodes": nodes,
+        "inputs": inputs,
+        "entries": entries,
+        "solves": solves,
+    }
+
+
+def estimate_from_sensitivity(sensitivity: Dict[str, Any], deltas: Dict[str, float]) -> Dict[str, Any]:
+    """Apply input deltas to a sensitivity matrix and return linearized node pressures.
+
+    Raises ValueError for deltas on unknown inputs. ``resolve_required`` is
+    set when any delta leaves the trusted range of its input.
+    """
+    inputs = {inp["id"]: inp for inp in sensitivity.get("inputs", [])}
+    unknown = [input_id for input_id in deltas if input_id not in inputs]
+    if unknown:
+        raise ValueError(f"Unknown sensitivity inputs: {', '.join(unknown)}")
+
+    out_of_range = [
+        input_id for input_id, delta in deltas.items()
+        if abs(delta) > inputs[input_id]["max_delta"]
+    ]
+
+    shifts: Dict[str, float] = {}
+    for entry in sensitivity.get("entries", []):
+        delta = deltas.get(entry["input_id"])
+        if delta:
+            shifts[entry["node_id"]] = shifts.get(entry["node_id"], 0.0) + entry["dp_dinput"] * delta
+
+    node_results = []
+    for node in sensitivity.get("nodes", []):
+        result = {"id": node["id"]}
+        if node.get("pressure_bar") is not None:
+            result["pressure_bar"] = node["pressure_bar"] + shifts.get(node["id"], 0.0)
+
+        if node.get("p_min_bar") is not None:
+            actual_pressure = result.get("pressure_bar")
+            if actual_pressure is not None and actual_pressure >= node["p_min_bar"]:
+                result["status"] = "OK"
+            else:
+                result["status"] = "pressure too low"
+
+        node_results.append(result)
+
+    if out_of_range:
+        message = f"Deltas outside linearization range, full re-solve required: {', '.join(out_of_range)}"
+    else:
+        message = "Linearized estimate"
+
+    return {
+        "nodes": node_results,
+        "resolve_required": bool(out_of_range),
+        "message": message,
+    }
+
+
+class _SolveBudgetExhausted(Exception):
+    pass
+
+
+class _Infeasible(Exception):
+    pass
+
+
+# Setpoints searched by optimize_setpoints, in the order they are lowered:
+# compressor ratios first (compression work), then ext_grid supply pressures.
+OPTIMIZE_TABLES = ("compressor", "ext_grid")
+
+# Smallest accepted bracket width; keeps the search well above float resolution
+MIN_OPTIMIZE_TOLERANCE = 1e-6
+
+# Bracket steps per setpoint; each step shrinks the bracket by at least 10%,
+# so this covers any bracket/tolerance ratio up to about 1e9
+MAX_BRACKET_STEPS = 200
+
+
+def _warm_start(net: pp.pandapipesNet) -> None:
+    """Seed junction initial pressures with the last converged results."""
+    if getattr(net, "converged", False) and len(net.res_junction) == len(net.junction):
+        pressures = net.res_junction.p_bar.values
+        if not any(math.isnan(p) for p in pressures):
+            net.junction["pn_bar"] = pressures
+
+
+def optimize_setpoints(
+    net: pp.pandapipesNet,
+    original_data: Dict[str, Any],
+    tolerance: float = 0.01,
+    min_p_bar: float = 1.0,
+    max_p_bar: float = 100.0,
+    min_pressure_ratio: float = 1.0,
+    max_pressure_ratio: float = 3.0,
+    max_solves: int = 200,
+) -> Dict[str, Any]:
+    """Find minimal compressor ratios and ext_grid pressures that keep every sink above p_min_bar.
+
+    Each setpoint is lowered in turn, holding the others fixed, by bracketing
+    the smallest feasible value between its lower bound and its current
+    feasible value. Probes use a secant step on the worst sink margin, falling
+    back to bisection, until the bracket is narrower than ``tolerance``.
+    Every pipeflow is warm-started from the previous solution and results are
+    cached by setpoint vector, so repeated probes do not cost another solve.
+
+    Raises ValueError if ``tolerance`` is below MIN_OPTIMIZE_TOLERANCE.
+    ``max_solves`` includes the final solve at the optimum. When the budget
+    runs out, the search stops and the remaining setpoints keep their last
+    feasible values.
+    """
+    if not tolerance >= MIN_OPTIMIZE_TOLERANCE:
+        raise ValueError(f"tolerance must be at least {MIN_OPTIMIZE_TOLERANCE}")
+
+    variables = [inp for inp in _sensitivity_inputs(original_data) if inp["table"] in OPTIMIZE_TABLES]
+    variables.sort(key=lambda inp: OPTIMIZE_TABLES.index(inp["table"]))
+    bounds = {
+        "compressor": (min_pressure_ratio, max_pressure_ratio),
+        "ext_grid": (min_p_bar, max_p_bar),
+    }
+
+    sinks = [
+        (i, node_data.get("params", {}).get("p_min_bar", 0))
+        for i, node_data in enumerate(original_data.get("nodes", []))
+        if node_data["type"] == "sink"
+    ]
+
+    cache: Dict[tuple, float] = {}
+    stats = {"solves": 0, "cache_hits": 0}
+
+    def set_values(values: List[float]) -> None:
+        for inp, value in zip(variables, values):
+            net[inp["table"]].at[inp["index"], inp["column"]] = value
+
+    def margin(values: List[float]) -> float:
+        """Worst sink pressure margin in bar; -inf if the solve fails."""
+        # Exact values: rounding would let two different probes share one margin
+        key = tuple(values)
+        if key in cache:
+            stats["cache_hits"] += 1
+            return cache[key]
+        # One solve is kept back for the results at the optimum
+        if stats["solves"] >= max_solves - 1:
+            raise _SolveBudgetExhausted()
+
+        set_values(values)
+        stats["solves"] += 1
+        try:
+            pp.pipeflow(net)
+            pressures = net.res_junction.p_bar.values
+            result = min((pressures[i] - p_min for i, p_min in sinks), default=math.inf)
+            if math.isnan(result):
+                result = -math.inf
+            _warm_start(net)
+        except Exception:
+            result = -math.inf
+        cache[key] = result
+        return result
+
+    initial = [float(net[inp["table"]].at[inp["index"], inp["column"]]) for inp in variables]
+    values = list(initial)
+
+    if not sinks or not variables:
+        message = "Nothing to optimize: network has no sinks or no adjustable setpoints"
+    else:
+        feasible = False
+        try:
+            if margin(values) < 0:
+                values = [bounds[inp["table"]][1] for inp in variables]
+                if margin(values) < 0:
+                    raise _Infeasible()
+            feasible = True
+
+            for k, inp in enumerate(variables):
+                lo = bounds[inp["table"]][0]
+                hi = values[k]
+                try:
+                    hi_margin = margin(values)
+                    lo_margin = margin(values[:k] + [lo] + values[k + 1:])
+                    if lo_margin >= 0:
+                        hi = lo
+
+                    # Cache hits do not count against max_solves, so the step
+                    # limit is what guarantees termination
+                    steps = 0
+                    while hi - lo > tolerance and steps < MAX_BRACKET_STEPS:
+                        steps += 1
+                        width = hi - lo
+                        probe = lo + width / 2
+                        if math.isfinite(lo_margin) and hi_margin > lo_margin:
+                            # Secant step towards zero margin, kept away from the bracket ends
+                            secant = hi - hi_margin * width / (hi_margin - lo_margin)
+                            probe = min(max(secant, lo + 0.1 * width), hi - 0.1 * width)
+                        probe_margin = margin(values[:k] + [probe] + values[k + 1:])
+                        if probe_margin >= 0:
+                            hi, hi_margin = probe, probe_margin
+                        else:
+                            lo, lo_margin = probe, probe_margin
+                finally:
+                    # hi is always feasible, also when the budget runs out mid-search
+                    values[k] = hi
+
+            message = "Optimization completed successfully"
+
+        except _Infeasible:
+            message = "Sink pressures cannot be met within the setpoint bounds"
+            values = None
+        except _SolveBudgetExhausted:
+            if feasible:
+                message = (
+                    f"Solve budget of {max_solves} pipeflows exhausted; "
+                    "remaining setpoints kept at their last feasible values"
+                )
+            else:
+                message = f"Solve budget of {max_solves} pipeflows exhausted before a feasible setpoint was found"
+                values = None
+
+    if values is None:
+        set_values(initial)
+        return {
+            "setpoints": [],
+            "nodes": [],
+            "edges": [],
+            "success": False,
+            "solves": stats["solves"],
+            "cache_hits": stats["cache_hits"],
+            "message": message,
+        }
+
+    set_values(values)
+    setpoints = [
+        {
+            "id": inp["id"],
+            "element_id": inp["element_id"],
+            "parameter": inp["parameter"],
+            "value": value,
+            "initial_value": initial_value,
+        }
+        for inp, value, initial_value in zip(variables, values, initial)
+    ]
+
+    # Report full results at the optimum; the JSON carries the new setpoints
+    # so run_simulation sees the same parameters as the net
+    optimized_data = copy.deepcopy(original_data)
+    elements = {element["id"]: element for element in optimized_data.get("nodes", []) + optimized_data.get("edges", [])}
+    for setpoint in setpoints:
+        elements[setpoint["element_id"]].setdefault("params", {})[setpoint["parameter"]] = setpoint["value"]
+
+    results = run_simulation(net, optimized_data)
+    stats["solves"] += 1
+
+    # Judge the optimum by the reported sink statuses, not by the search's own margins
+    success = results["success"]
+    if not success:
+        message = results["message"]
+    else:
+        failing = [node["id"] for node in results["nodes"] if node.get("status") not in (None, "OK")]
+        if failing:
+            success = False
+            message = f"Optimized setpoints do not meet p_min_bar at: {', '.join(failing)}"
+
+    return {
+        "setpoints": setpoints,
+        "nodes": results["nodes"],
+        "edges": results["edges"],
+        "success": success,
+        "solves": stats["solves"],
+        "cache_hits": stats["cache_hits"],
+        "message": message,
+    }
+
+
+# Small network solved once at startup to load fluid tables and compile solver code paths
+WARM_UP_NETWORK = {
+    "nodes": [
+        {"id": "ext_grid", "type": "external_grid", "params": {"p_bar": 20.0, "t_k": 293.15}},
+        {"id": "junction", "type": "junction", "params": {"pn_bar": 20.0}},
+        {"id": "sink", "type": "sink", "params": {"demand_kg_per_s": 1.0, "p_min_bar": 0.0, "pn_bar": 20.0}},
+    ],
+    "edges": [
+        {"id": "pipe_1", "from_node": "ext_grid", "to_node": "junction", "type": "pipe",
+         "params": {"length_m": 1000, "diameter_m": 0.2}},
+        {"id": "pipe_2", "from_node": "junction", "to_node": "sink", "type": "pipe",
+         "params": {"length_m": 1000, "diameter_m": 0.2}},
+    ],
+}
+
+
+def warm_up(fluids: List[str] = ("lgas",)) -> None:
+    """Cache empty networks for ``fluids`` and run one simulation so the first request does not pay for it."""
+    for fluid in fluids:
+        net = create_network_from_json(WARM_UP_NETWORK, fluid=fluid)
+        results = run_simulation(net, WARM_UP_NETWORK)
+        if not results["success"]:
+            raise RuntimeError(results["message"])
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
@@ -78,13 +78,81 @@ class SimulationEdgeResult(BaseModel):
     mdot_kg_per_s: Optional[float] = None
     velocity_m_per_s: Optional[float] = None
 
+class SensitivityNode(BaseModel):
+    id: str
+    pressure_bar: Optional[float] = None
+    p_min_bar: Optional[float] = None  # for sinks
+
+class SensitivityInput(BaseModel):
+    id: str  # "<element_id>.<parameter>"
+    element_id: str
+    parameter: str  # p_bar, mdot_kg_per_s, pressure_ratio
+    value: float
+    max_delta: float  # range in which linearized estimates are trusted
+
+class SensitivityEntry(BaseModel):
+    node_id: str
+    input_id: str
+    dp_dinput: float
+
+class SensitivityResult(BaseModel):
+    nodes: List[SensitivityNode]
+    inputs: List[SensitivityInput]
+    entries: List[SensitivityEntry]  # sparse dp_node/d_input
+    solves: int
+
 class SimulationResponse(BaseModel):
     nodes: List[SimulationNodeResult]
     edges: List[SimulationEdgeResult]
     success: bool
     message: Optional[str] = None
+    sensitivity: Optional[SensitivityResult] = None
+
+class EstimateRequest(BaseModel):
+    sensitivity: SensitivityResult
+    deltas: Dict[str, float]  # input id -> change
+
+class EstimateResponse(BaseModel):
+    nodes: List[SimulationNodeResult]
+    resolve_required: bool
+    message: Optional[str] = None
 
 class SaveNetworkRequest(BaseModel):
     name: str
     description: Optional[str] = None
-    network: NetworkRequest
\ No newline at end of file
+    network: NetworkRequest
+
+class OptimizeOptions(BaseModel):
+    tolerance: float = Field(0.01, ge=1e-6)  # bracket width in bar / pressure ratio
+    min_p_bar: float = 1.0
+    max_p_bar: float = 100.0
+    min_pressure_ratio: float = 1.0
+    max_pressure_ratio: float = 3.0
+    max_solves: int = Field(200, ge=2)  # includes the final solve at the optimum
+
+    @model_validator(mode="after")
+    def check_bounds(self):
+        if self.min_p_bar > self.max_p_bar:
+            raise ValueError("min_p_bar must not exceed max_p_bar")
+        if self.min_pressure_ratio > self.max_pressure_ratio:
+            raise ValueError("min_pressure_ratio must not exceed max_pressure_ratio")
+        return self
+
+class OptimizeRequest(OptimizeOptions):
+    network: NetworkRequest
+
+class OptimizedSetpoint(BaseModel):
+    id: str  # "<element_id>.<parameter>"
+    element_id: str
+    parameter: str  # p_bar, pressure_ratio
+    value: float
+    initial_value: float
+
+class OptimizeResponse(BaseModel):
+    setpoints: List[OptimizedSetpoint]
+    nodes: List[SimulationNodeResult]
+    edges: List[SimulationEdgeResult]
+    success: bool
+    solves: int
+    cache_hits: int
+    message: Optional[str] = None
\ No newline at end of file
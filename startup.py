@@ -0,0 +1,63 @@
+"""
+Application warm-up and readiness.
+
+Importing pandapipes and running the first pipeflow are the slowest steps
+of a cold start. They run in a background thread so that the server
+accepts connections right away; /api/ready reports 503 until they are done.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+# Fluids whose property tables are loaded during warm-up
+WARM_UP_FLUIDS = [f for f in os.environ.get("WARM_UP_FLUIDS", "lgas").split(",") if f]
+
+_process_start = time.perf_counter()
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_state = {
+    "ready": False,
+    "error": None,
+    "timings": {},
+}
+
+
+def warm_up() -> None:
+    """Import the simulation stack and solve a small network; records timings."""
+    try:
+        start = time.perf_counter()
+        import pandapipes_adapter
+        imported = time.perf_counter()
+
+        pandapipes_adapter.warm_up(WARM_UP_FLUIDS)
+        finished = time.perf_counter()
+
+        _state["timings"] = {
+            "import_s": imported - start,
+            "warm_up_s": finished - imported,
+            "ready_after_s": finished - _process_start,
+        }
+        _state["ready"] = True
+    except Exception as e:
+        _state["error"] = str(e)
+
+
+def start_warm_up() -> None:
+    """Run warm_up() in a background thread unless it already ran or is running."""
+    global _thread
+
+    with _lock:
+        if _state["ready"] or (_thread is not None and _thread.is_alive()):
+            return
+        _thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+        _thread.start()
+
+
+def readiness() -> dict:
+    return {
+        "ready": _state["ready"],
+        "error": _state["error"],
+        "timings": dict(_state["timings"]),
+    }
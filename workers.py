@@ -0,0 +1,76 @@
+"""
+Multi-worker server mode.
+
+The parent imports pandapipes and runs the warm-up solve once, starts the
+shared cache server, binds the listening socket and then forks the
+workers. Forked workers start out ready and share the parent's imported
+module pages copy-on-write instead of each importing pandapipes again.
+"""
+
+import gc
+import os
+import shutil
+import signal
+
+import uvicorn
+
+from cache import start_cache_server
+from database import engine, init_db
+from startup import warm_up
+
+
+def serve_forked(app, host: str = "0.0.0.0", port: int = 8000, workers: int = 2) -> None:
+    """Serve ``app`` from ``workers`` forked uvicorn processes sharing one socket and cache."""
+    # Load and warm up the simulation stack once, before forking
+    init_db()
+    warm_up()
+
+    manager = start_cache_server()
+
+    config = uvicorn.Config(app, host=host, port=port)
+    sock = config.bind_socket()
+
+    # Connections must not be shared across processes
+    engine.dispose()
+
+    # Keep the preloaded objects out of the collector so that GC passes in
+    # the workers do not touch (and copy) the shared pages
+    gc.freeze()
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                uvicorn.Server(config).run(sockets=[sock])
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def stop_children(signum, frame):
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop_children)
+    signal.signal(signal.SIGTERM, stop_children)
+
+    try:
+        for child in children:
+            while True:
+                try:
+                    os.waitpid(child, 0)
+                    break
+                except InterruptedError:
+                    continue
+                except ChildProcessError:
+                    break
+    finally:
+        sock.close()
+        address = manager.address
+        manager.shutdown()
+        shutil.rmtree(os.path.dirname(address), ignore_errors=True)